@@ -1,89 +1,247 @@
 import time
+import math
 import random
 import os
 import sys
-from dotenv import load_dotenv
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver import ActionChains
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.common.keys import Keys
+import importlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
+# Selenium and python-dotenv are imported lazily: the heavy selenium package is
+# loaded on a background thread during startup, and every function below that
+# needs it only runs once the browser is up, so its local imports are free.
+
+# Record process start so we can report time-to-first-navigation
+START_TIME = time.perf_counter()
 
 # === FORCE UTF-8 OUTPUT ===
 if hasattr(sys.stdout, "reconfigure"):
     sys.stdout.reconfigure(encoding="utf-8")
 
-# Load environment variables from .env file
-load_dotenv()
+COIN_PAGE_URL = "https://s.click.aliexpress.com/e/_DB2kEjh"
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36"
+
+# For Chrome 135, use a direct URL - sometimes the API is not updated fast enough
+CFT_VERSION = "135.0.7049.0"  # Match to your Chrome version
+
+def load_credentials():
+    """Load the AliExpress credentials from the .env file or the environment"""
+    from dotenv import load_dotenv
+
+    # Load environment variables from .env file
+    load_dotenv()
+
+    # Get credentials from environment variables
+    email = os.getenv("ALIEXPRESS_EMAIL")
+    password = os.getenv("ALIEXPRESS_PASSWORD")
+
+    # Check if credentials are available
+    if not email or not password:
+        print("Error: Environment variables for ALIEXPRESS_EMAIL and ALIEXPRESS_PASSWORD must be set.")
+        print("Please create a .env file with these variables or set them in your environment.")
+        return None
+
+    return email, password
+
+# Total seconds one account run may take, from first navigation to the final
+# result. Pick a class with ALIEXPRESS_ACCOUNT_CLASS or set an explicit number
+# of seconds with ALIEXPRESS_RUN_BUDGET.
+ACCOUNT_CLASS_BUDGETS = {
+    "trusted": 180,   # Already set to Korea, rarely challenged
+    "standard": 300,
+    "new": 480,       # Fresh accounts see more login challenges
+}
+DEFAULT_ACCOUNT_CLASS = "standard"
+
+# Upper bounds for a single page load and element wait, further capped by the run budget
+PAGE_LOAD_TIMEOUT = 60
+ELEMENT_WAIT_TIMEOUT = 15
+
+class RunTimeout(BaseException):
+    """Raised when a run's budget is used up.
+
+    Derives from BaseException so the broad ``except Exception`` fallbacks in
+    the step functions let it through instead of trying the next selector.
+    """
+
+    def __init__(self, step):
+        super().__init__(f"timed out at step {step}")
+        self.step = step
+
+class RunBudget:
+    """Deadline for one account run, shared by every wait and sleep in it.
+
+    It also keeps how long the site took to serve each step of each attempt
+    and how many selector fallbacks each step of the latest attempt needed,
+    which the concurrency controller feeds on. Only waits on the site are
+    timed, not our own pauses.
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.started = time.monotonic()
+        self.deadline = self.started + seconds
+        self.step = "start"
+        self.attempt = 1
+        self.site_latencies = {}
+        self.fallbacks = {}
+
+    def enter(self, step):
+        """Mark the start of a new step, aborting if the budget is already spent"""
+        self.check()
+        self.step = step
+
+    def start_attempt(self, attempt):
+        """Begin a new collection attempt, forgetting the previous attempt's fallbacks"""
+        self.attempt = attempt
+        self.fallbacks = {}
+
+    def record_fallback(self):
+        """Note that the current step had to fall back to its next selector"""
+        self.fallbacks[self.step] = self.fallbacks.get(self.step, 0) + 1
+
+    def fallback_depth(self):
+        """Deepest selector fallback any step of the latest attempt needed"""
+        return max(self.fallbacks.values(), default=0)
+
+    def record_site_wait(self, seconds):
+        """Add a successful wait on the site to the current step of the current attempt"""
+        key = f"{self.step} (attempt {self.attempt})"
+        self.site_latencies[key] = self.site_latencies.get(key, 0.0) + seconds
 
-# Get credentials from environment variables
-ALIEXPRESS_EMAIL = os.getenv("ALIEXPRESS_EMAIL")
-ALIEXPRESS_PASSWORD = os.getenv("ALIEXPRESS_PASSWORD")
+    def elapsed(self):
+        return time.monotonic() - self.started
 
-# Check if credentials are available
-if not ALIEXPRESS_EMAIL or not ALIEXPRESS_PASSWORD:
-    print("Error: Environment variables for ALIEXPRESS_EMAIL and ALIEXPRESS_PASSWORD must be set.")
-    print("Please create a .env file with these variables or set them in your environment.")
-    exit(1)
+    def remaining(self):
+        return max(0.0, self.deadline - time.monotonic())
 
-def random_sleep(min_seconds=1, max_seconds=3):
+    def check(self):
+        """Raise RunTimeout if no time is left"""
+        if self.remaining() <= 0:
+            raise RunTimeout(self.step)
+
+    def timeout(self, seconds):
+        """Shrink a wait of the given length to the time left"""
+        self.check()
+        return min(seconds, self.remaining())
+
+    def sleep(self, seconds):
+        """Sleep for the given time, or until the deadline if that comes first"""
+        time.sleep(self.timeout(seconds))
+        self.check()
+
+def account_class_budget(account_class):
+    """Return the run budget in seconds for an account class"""
+    if account_class not in ACCOUNT_CLASS_BUDGETS:
+        print(f"Warning: Unknown account class '{account_class}', using '{DEFAULT_ACCOUNT_CLASS}'")
+        account_class = DEFAULT_ACCOUNT_CLASS
+    return ACCOUNT_CLASS_BUDGETS[account_class]
+
+def load_run_budget():
+    """Build the run budget for the configured account class"""
+    account_class = os.getenv("ALIEXPRESS_ACCOUNT_CLASS", DEFAULT_ACCOUNT_CLASS)
+    seconds = account_class_budget(account_class)
+
+    override = os.getenv("ALIEXPRESS_RUN_BUDGET")
+    if override:
+        try:
+            value = float(override)
+        except ValueError:
+            value = None
+        if value is not None and math.isfinite(value) and value > 0:
+            seconds = value
+        else:
+            print(f"Warning: Ignoring invalid ALIEXPRESS_RUN_BUDGET value '{override}'")
+
+    print(f"Run budget: {seconds:g}s (account class '{account_class}')")
+    return RunBudget(seconds)
+
+def random_sleep(min_seconds=1, max_seconds=3, budget=None):
     """Sleep for a random amount of time to mimic human behavior"""
-    time.sleep(random.uniform(min_seconds, max_seconds))
+    seconds = random.uniform(min_seconds, max_seconds)
+    if budget:
+        budget.sleep(seconds)
+    else:
+        time.sleep(seconds)
+
+def wait_for(driver, budget, condition, seconds=None):
+    """Wait until the condition holds, for at most the given time or what is left of the budget"""
+    from selenium.webdriver.support.ui import WebDriverWait
 
-def move_mouse_randomly(driver, element):
+    started = time.monotonic()
+    element = WebDriverWait(driver, budget.timeout(seconds or ELEMENT_WAIT_TIMEOUT)).until(condition)
+    budget.record_site_wait(time.monotonic() - started)
+    return element
+
+def navigate(driver, url, budget):
+    """Load a page, giving up when the run's budget runs out"""
+    driver.set_page_load_timeout(budget.timeout(PAGE_LOAD_TIMEOUT))
+    started = time.monotonic()
+    try:
+        driver.get(url)
+    except Exception:
+        # A page load cut short by the budget is a timeout, not a page error
+        budget.check()
+        raise
+    budget.record_site_wait(time.monotonic() - started)
+
+def move_mouse_randomly(driver, element, budget=None):
     """Move mouse with human-like randomness before clicking - safer version"""
+    from selenium.webdriver import ActionChains
+
     try:
         # Simply move directly to the element - safest approach
         actions = ActionChains(driver)
         actions.move_to_element(element)
         actions.perform()
-        random_sleep(0.3, 0.7)
+        random_sleep(0.3, 0.7, budget)
     except Exception as e:
         print(f"Warning: Simple mouse movement failed: {e}. Trying direct click.")
 
-def type_like_human(element, text):
+def type_like_human(element, text, budget=None):
     """Type text with human-like timing and occasional mistakes that get corrected"""
+    from selenium.webdriver.common.keys import Keys
+
     for char in text:
         # Randomly decide if we make a typo (1% chance)
         if random.random() < 0.01:
             # Make a typo
             typo_char = random.choice('qwertyuiopasdfghjklzxcvbnm')
             element.send_keys(typo_char)
-            random_sleep(0.1, 0.3)
+            random_sleep(0.1, 0.3, budget)
             # Delete the typo
             element.send_keys(Keys.BACKSPACE)
-            random_sleep(0.2, 0.5)
+            random_sleep(0.2, 0.5, budget)
         
         # Type the correct character
         element.send_keys(char)
         
         # Random pause between keystrokes
-        random_sleep(0.05, 0.15)
+        random_sleep(0.05, 0.15, budget)
         
         # Occasionally pause longer as if thinking
         if random.random() < 0.05:
-            random_sleep(0.5, 1.2)
+            random_sleep(0.5, 1.2, budget)
 
-def login(driver):
+def login(driver, email, password, budget):
     """Perform the login process with human-like behavior"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+
     try:
+        budget.enter("login")
         print("Starting login process...")
         
         # Wait for the email input field
-        wait = WebDriverWait(driver, 15)
-        email_input = wait.until(
+        email_input = wait_for(driver, budget,
             EC.presence_of_element_located((By.CSS_SELECTOR, "input.cosmos-input[label='Email']"))
         )
         print("Found email input field")
         
         # Ensure email field is visible in the viewport
         driver.execute_script("arguments[0].scrollIntoView({behavior: 'auto', block: 'center'});", email_input)
-        random_sleep(1, 2)
+        random_sleep(1, 2, budget)
         
         # Try to click directly without sophisticated mouse movement
         try:
@@ -92,15 +250,15 @@ def login(driver):
             print(f"Direct click failed: {e}, trying JavaScript click")
             driver.execute_script("arguments[0].click();", email_input)
         
-        random_sleep(0.5, 1.5)
+        random_sleep(0.5, 1.5, budget)
         
         # Type email with human-like behavior
         print("Entering email address...")
-        type_like_human(email_input, ALIEXPRESS_EMAIL)  # Use environment variable
-        random_sleep(1, 2)
+        type_like_human(email_input, email, budget)
+        random_sleep(1, 2, budget)
         
         # Find and click the Continue button
-        continue_button = wait.until(
+        continue_button = wait_for(driver, budget,
             EC.element_to_be_clickable((By.XPATH, 
                 "//button[contains(@class, 'cosmos-btn-primary') and .//span[text()='Continue']]"))
         )
@@ -108,7 +266,7 @@ def login(driver):
         
         # Ensure button is in view and click it
         driver.execute_script("arguments[0].scrollIntoView({behavior: 'auto', block: 'center'});", continue_button)
-        random_sleep(0.5, 1)
+        random_sleep(0.5, 1, budget)
         
         try:
             continue_button.click()
@@ -117,17 +275,17 @@ def login(driver):
             driver.execute_script("arguments[0].click();", continue_button)
             
         print("Clicked continue button")
-        random_sleep(2, 3)
+        random_sleep(2, 3, budget)
         
         # Wait for password field to appear
-        password_input = wait.until(
+        password_input = wait_for(driver, budget,
             EC.presence_of_element_located((By.ID, "fm-login-password"))
         )
         print("Found password field")
         
         # Ensure password field is in view
         driver.execute_script("arguments[0].scrollIntoView({behavior: 'auto', block: 'center'});", password_input)
-        random_sleep(0.5, 1)
+        random_sleep(0.5, 1, budget)
         
         # Click on password field
         try:
@@ -136,15 +294,15 @@ def login(driver):
             print(f"Direct click failed: {e}, trying JavaScript click")
             driver.execute_script("arguments[0].click();", password_input)
             
-        random_sleep(0.5, 1)
+        random_sleep(0.5, 1, budget)
         
         # Type password with human-like behavior
         print("Entering password...")
-        type_like_human(password_input, ALIEXPRESS_PASSWORD)  # Use environment variable
-        random_sleep(1, 2)
+        type_like_human(password_input, password, budget)
+        random_sleep(1, 2, budget)
         
         # Find and click the Sign in button
-        sign_in_button = wait.until(
+        sign_in_button = wait_for(driver, budget,
             EC.element_to_be_clickable((By.XPATH, 
                 "//button[contains(@class, 'cosmos-btn-primary') and .//span[text()='Sign in']]"))
         )
@@ -152,7 +310,7 @@ def login(driver):
         
         # Ensure sign in button is in view and click it
         driver.execute_script("arguments[0].scrollIntoView({behavior: 'auto', block: 'center'});", sign_in_button)
-        random_sleep(0.5, 1)
+        random_sleep(0.5, 1, budget)
         
         try:
             sign_in_button.click()
@@ -164,7 +322,7 @@ def login(driver):
         
         # Wait for login to complete
         # Give more time for the login process to complete
-        random_sleep(5, 7)
+        random_sleep(5, 7, budget)
         print("Login successful")
         
         return True
@@ -173,33 +331,37 @@ def login(driver):
         print(f"Login failed: {e}")
         return False
 
-def change_country_to_korea(driver):
+def change_country_to_korea(driver, budget):
     """Change the country to Korea using the ship-to dropdown with manual confirmation at each step"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+
     try:
-        wait = WebDriverWait(driver, 15)
-        
         # Look for the ship-to dropdown with the exact class structure from the HTML
+        budget.enter("ship-to dropdown")
         print("Looking for the ship-to dropdown...")
         try:
             # Try to find the main ship-to menu item
-            ship_to_dropdown = wait.until(
+            ship_to_dropdown = wait_for(driver, budget,
                 EC.element_to_be_clickable((By.XPATH, 
                     "//div[contains(@class, 'ship-to--menuItem--')]"))
             )
             print("Found ship-to dropdown using menuItem class")
         except Exception as e:
             print(f"menuItem selector failed: {e}, trying alternative selector")
+            budget.record_fallback()
             # Try looking for the div containing USD with dropdown icon
             try:
-                ship_to_dropdown = wait.until(
+                ship_to_dropdown = wait_for(driver, budget,
                     EC.element_to_be_clickable((By.XPATH, 
                         "//div[contains(@class, 'ship-to--text--')]/b[contains(text(), 'USD')]"))
                 )
                 print("Found ship-to dropdown using USD text")
             except Exception as e2:
                 print(f"USD text selector failed too: {e2}, trying broader selector")
+                budget.record_fallback()
                 # Try the most specific element that should be unique to this dropdown
-                ship_to_dropdown = wait.until(
+                ship_to_dropdown = wait_for(driver, budget,
                     EC.element_to_be_clickable((By.XPATH, 
                         "//div[contains(@class, 'es--wrap--')]/div/div[contains(@class, 'ship-to--menuItem--')]"))
                 )
@@ -207,12 +369,12 @@ def change_country_to_korea(driver):
         
         # Scroll to make the dropdown visible
         driver.execute_script("arguments[0].scrollIntoView({behavior: 'auto', block: 'center'});", ship_to_dropdown)
-        random_sleep(1, 2)
+        random_sleep(1, 2, budget)
         
         # Highlight the element to make it visible in logs
         driver.execute_script("arguments[0].style.border='3px solid red'", ship_to_dropdown)
         print("STEP 1: Ship-to dropdown found. Clicking automatically...")
-        random_sleep(1, 1)
+        random_sleep(1, 1, budget)
         
         # Click on the ship-to dropdown
         try:
@@ -223,13 +385,14 @@ def change_country_to_korea(driver):
             driver.execute_script("arguments[0].click();", ship_to_dropdown)
             print("Clicked ship-to dropdown using JavaScript")
         
-        random_sleep(2, 3)
+        random_sleep(2, 3, budget)
         
         # Now look for the Korea option in the country dropdown section
         # First, find the country selector text element
         try:
+            budget.enter("country selector")
             print("Looking for country selector...")
-            country_selector = wait.until(
+            country_selector = wait_for(driver, budget,
                 EC.element_to_be_clickable((By.XPATH, 
                     "//div[contains(@class, 'select--text--1b85oDo')]"))
             )
@@ -238,11 +401,11 @@ def change_country_to_korea(driver):
             # Highlight the element
             driver.execute_script("arguments[0].style.border='3px solid red'", country_selector)
             print("STEP 2: Country selector found. Clicking automatically...")
-            random_sleep(1, 1)
+            random_sleep(1, 1, budget)
             
             # Click on the country selector to open the dropdown
             driver.execute_script("arguments[0].scrollIntoView({behavior: 'auto', block: 'center'});", country_selector)
-            random_sleep(0.5, 1)
+            random_sleep(0.5, 1, budget)
             
             try:
                 country_selector.click()
@@ -252,10 +415,11 @@ def change_country_to_korea(driver):
                 driver.execute_script("arguments[0].click();", country_selector)
                 print("Clicked country selector using JavaScript")
                 
-            random_sleep(1.5, 2.5)
+            random_sleep(1.5, 2.5, budget)
             
             # Now that the country dropdown is open, search for Korea
-            search_input = wait.until(
+            budget.enter("country search")
+            search_input = wait_for(driver, budget,
                 EC.presence_of_element_located((By.XPATH, 
                     "//div[contains(@class, 'select--search--20Pss08')]/input"))
             )
@@ -264,16 +428,16 @@ def change_country_to_korea(driver):
             # Highlight the element
             driver.execute_script("arguments[0].style.border='3px solid red'", search_input)
             print("STEP 3: Search input found. Clicking and typing 'Korea' or '대한민국' automatically...")
-            random_sleep(1, 1)
+            random_sleep(1, 1, budget)
             
             # Click on search input and type 'Korea' or '대한민국' (Republic of Korea in Korean)
             search_input.click()
-            random_sleep(0.5, 1)
+            random_sleep(0.5, 1, budget)
             
             # Try with English first, if that fails, try Korean
             search_term = "Korea"
-            type_like_human(search_input, search_term)
-            random_sleep(1, 2)
+            type_like_human(search_input, search_term, budget)
+            random_sleep(1, 2, budget)
             
             # Check if any results were found, if not, try with Korean
             korea_options = driver.execute_script("""
@@ -286,31 +450,34 @@ def change_country_to_korea(driver):
             if not korea_options or len(korea_options) == 0:
                 print("No results found with English 'Korea', trying with Korean '대한민국'")
                 search_input.clear()
-                random_sleep(0.5, 1)
-                type_like_human(search_input, "대한민국")  # Republic of Korea in Korean
-                random_sleep(1, 2)
+                random_sleep(0.5, 1, budget)
+                type_like_human(search_input, "대한민국", budget)  # Republic of Korea in Korean
+                random_sleep(1, 2, budget)
             
             # Find and click on Korea from the filtered list
+            budget.enter("Korea option")
             print("Looking for Korea option in the dropdown popup...")
             
             try:
                 # Try with a more specific XPath targeting the exact structure (English or Korean)
-                korea_option = wait.until(
+                korea_option = wait_for(driver, budget,
                     EC.element_to_be_clickable((By.XPATH, 
                         "//div[@class='select--item--32FADYB' and (contains(., 'Korea') or contains(., '대한민국'))]"))
                 )
                 print("Found Korea option with exact class match")
             except Exception as e:
                 print(f"First Korea selector failed: {e}, trying alternative approach")
+                budget.record_fallback()
                 try:
                     # Try with a more general approach that looks for any div containing Korea with similar structure
-                    korea_option = wait.until(
+                    korea_option = wait_for(driver, budget,
                         EC.element_to_be_clickable((By.XPATH, 
                             "//div[contains(@class, 'select--item') and .//span[(contains(text(), 'Korea') or contains(text(), '대한민국'))]]"))
                     )
                     print("Found Korea option with general class and span")
                 except Exception as e2:
                     print(f"Second Korea selector failed: {e2}, trying direct JavaScript selection")
+                    budget.record_fallback()
                     # Use JavaScript to find elements containing Korea text (English or Korean)
                     korea_options = driver.execute_script("""
                         return Array.from(document.querySelectorAll('div'))
@@ -322,7 +489,7 @@ def change_country_to_korea(driver):
                         print("Found Korea option using JavaScript")
                     else:
                         # Last resort - try to find by the flag class
-                        korea_option = wait.until(
+                        korea_option = wait_for(driver, budget,
                             EC.element_to_be_clickable((By.XPATH, 
                                 "//span[contains(@class, 'country-flag') and contains(@class, 'KR')]/following-sibling::span"))
                         ).parent
@@ -333,10 +500,10 @@ def change_country_to_korea(driver):
             # Highlight the element
             driver.execute_script("arguments[0].style.border='3px solid red'", korea_option)
             print("STEP 4: Korea option found. Clicking automatically...")
-            random_sleep(1, 1)
+            random_sleep(1, 1, budget)
             
             driver.execute_script("arguments[0].scrollIntoView({behavior: 'auto', block: 'center'});", korea_option)
-            random_sleep(0.5, 1)
+            random_sleep(0.5, 1, budget)
             
             try:
                 korea_option.click()
@@ -346,7 +513,7 @@ def change_country_to_korea(driver):
                 driver.execute_script("arguments[0].click();", korea_option)
                 print("Selected Korea using JavaScript")
             
-            random_sleep(1.5, 2.5)
+            random_sleep(1.5, 2.5, budget)
             
         except Exception as e:
             print(f"Country selection process failed: {e}")
@@ -354,7 +521,8 @@ def change_country_to_korea(driver):
         
         # Look for Save button
         try:
-            save_button = wait.until(
+            budget.enter("save button")
+            save_button = wait_for(driver, budget,
                 EC.element_to_be_clickable((By.XPATH, 
                     "//div[contains(@class, 'es--saveBtn--w8EuBuy')]"))
             )
@@ -363,10 +531,10 @@ def change_country_to_korea(driver):
             # Highlight the element
             driver.execute_script("arguments[0].style.border='3px solid red'", save_button)
             print("STEP 5: Save button found. Clicking automatically...")
-            random_sleep(1, 1)
+            random_sleep(1, 1, budget)
             
             driver.execute_script("arguments[0].scrollIntoView({behavior: 'auto', block: 'center'});", save_button)
-            random_sleep(0.5, 1)
+            random_sleep(0.5, 1, budget)
             
             # Click Save button
             try:
@@ -377,7 +545,7 @@ def change_country_to_korea(driver):
                 driver.execute_script("arguments[0].click();", save_button)
                 print("Clicked save button using JavaScript")
             
-            random_sleep(3, 5)
+            random_sleep(3, 5, budget)
             print("Country has been saved")
             print("STEP 6: Country change complete. Continuing to the coin collection page...")
             
@@ -391,15 +559,19 @@ def change_country_to_korea(driver):
         print(f"Country change failed: {e}")
         return False
 
-def verify_korea_selected(driver):
+def verify_korea_selected(driver, budget):
     """Verify that Korea is currently selected as the country"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+
     try:
-        wait = WebDriverWait(driver, 10)
+        budget.enter("verify country")
         
         # Look for ship-to text that contains Korea or 대한민국 (Republic of Korea in Korean)
-        ship_to_element = wait.until(
+        ship_to_element = wait_for(driver, budget,
             EC.presence_of_element_located((By.XPATH, 
-                "//div[contains(@class, 'ship-to--text--')]"))
+                "//div[contains(@class, 'ship-to--text--')]")),
+            seconds=10
         )
         
         # Get the text content
@@ -423,10 +595,13 @@ def verify_korea_selected(driver):
         print(f"Error verifying Korea selection: {e}")
         return False
 
-def find_and_click_collect_button(driver):
+def find_and_click_collect_button(driver, budget):
     """Find and click the coin collect button with multiple approaches"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+
+    budget.enter("collect button")
     print("STEP 7: Looking for the Collect button...")
-    wait = WebDriverWait(driver, 15)
     
     # List of possible selectors for the collect button - ordered from most to least specific
     collect_button_selectors = [
@@ -443,23 +618,23 @@ def find_and_click_collect_button(driver):
     for selector in collect_button_selectors:
         try:
             print(f"Trying to find collect button with selector: {selector}")
-            collect_button = wait.until(
+            collect_button = wait_for(driver, budget,
                 EC.presence_of_element_located((By.XPATH, selector))
             )
             print(f"Found the Collect button using selector: {selector}")
             
             # Highlight the button to make it more visible
             driver.execute_script("arguments[0].style.border='3px solid red'", collect_button)
-            random_sleep(1, 2)
+            random_sleep(1, 2, budget)
             
             # Scroll to make button visible if needed
             driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", collect_button)
-            random_sleep(1, 2)
+            random_sleep(1, 2, budget)
             
             # Try to click button with several methods
             try:
                 # Move mouse naturally to the button first
-                move_mouse_randomly(driver, collect_button)
+                move_mouse_randomly(driver, collect_button, budget)
                 
                 # Try normal click
                 collect_button.click()
@@ -470,11 +645,13 @@ def find_and_click_collect_button(driver):
                 print("Clicked collect button using JavaScript")
             
             # Wait after clicking to see the result
-            random_sleep(5, 7)
+            random_sleep(5, 7, budget)
             print("Collect button clicked successfully")
             return True
             
         except Exception as e:
+            # Not counted as a fallback: on a healthy site the page language
+            # decides which of these selectors matches first
             print(f"Couldn't find or click collect button with selector {selector}: {e}")
             continue
     
@@ -504,17 +681,17 @@ def find_and_click_collect_button(driver):
             # Try clicking the first potential button
             button = potential_buttons[0]
             driver.execute_script("arguments[0].style.border='3px solid red'", button)
-            random_sleep(1, 2)
+            random_sleep(1, 2, budget)
             
             # Scroll to button
             driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", button)
-            random_sleep(1, 2)
+            random_sleep(1, 2, budget)
             
             # Click the button using JavaScript
             driver.execute_script("arguments[0].click();", button)
             
             print("Clicked potential collect button using JavaScript")
-            random_sleep(5, 7)
+            random_sleep(5, 7, budget)
             return True
     except Exception as e:
         print(f"Fallback approach failed: {e}")
@@ -523,24 +700,26 @@ def find_and_click_collect_button(driver):
     print("*** WILL RESTART FROM STEP 1 (COUNTRY SELECTION) ***")
     return False
 
-def main():
-    """Main function to run the coin collection process"""
-    # Set up Chrome options
-    chrome_options = Options()
-    # chrome_options.add_argument("--headless")  # Uncomment to run in headless mode
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")  # Helps avoid detection
-    chrome_options.add_argument("--start-maximized")  # Start with maximized window
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option("useAutomationExtension", False)
-    
-    # Define path to chromedriver
-    import os
-    chromedriver_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "drivers")
-    os.makedirs(chromedriver_dir, exist_ok=True)
-    
-    # Use direct path to the chromedriver in the drivers folder
-    driver_path = os.path.join(chromedriver_dir, "chromedriver.exe")
-    
+
+def detect_chrome_version():
+    """Detect the installed Chrome major version from the Windows registry"""
+    try:
+        import winreg
+        key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r'Software\Google\Chrome\BLBeacon')
+        version, _ = winreg.QueryValueEx(key, 'version')
+        chrome_version = version.split('.')[0]  # Get major version
+        print(f"Detected Chrome version: {version} (Major: {chrome_version})")
+    except Exception as e:
+        print(f"Failed to detect Chrome version from registry: {e}")
+        chrome_version = "135"  # Default to Chrome 135
+    return chrome_version
+
+def download_chromedriver(chromedriver_dir, driver_path):
+    """Download and unzip the Chrome for Testing driver into the drivers folder"""
+    import urllib.request
+    import zipfile
+    import shutil
+
     # Always remove the existing ChromeDriver to ensure we get a fresh compatible version
     if os.path.exists(driver_path):
         try:
@@ -548,33 +727,12 @@ def main():
             print(f"Removed existing ChromeDriver: {driver_path}")
         except Exception as e:
             print(f"Could not remove existing ChromeDriver: {e}")
-    
+
     # Download and set up ChromeDriver
     print("Downloading compatible ChromeDriver version...")
     try:
-        # Get Chrome version from registry
-        import winreg
-        try:
-            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r'Software\Google\Chrome\BLBeacon')
-            version, _ = winreg.QueryValueEx(key, 'version')
-            chrome_version = version.split('.')[0]  # Get major version
-            print(f"Detected Chrome version: {version} (Major: {chrome_version})")
-        except Exception as e:
-            print(f"Failed to detect Chrome version from registry: {e}")
-            chrome_version = "135"  # Default to Chrome 135
-        
-        # Download ChromeDriver for Chrome 135+
-        import urllib.request
-        import zipfile
-        import shutil
-        
         # For Chrome 115+, we need to use the Chrome for Testing (CfT) drivers
-        print(f"Using Chrome for Testing driver for Chrome {chrome_version}")
-            
-        # For Chrome 135, use a direct URL - sometimes the API is not updated fast enough
-        cft_version = "135.0.7049.0"  # Match to your Chrome version
-        download_url = f"https://storage.googleapis.com/chrome-for-testing-public/{cft_version}/win64/chromedriver-win64.zip"
-        print(f"Using direct URL for Chrome {chrome_version}: {download_url}")
+        download_url = f"https://storage.googleapis.com/chrome-for-testing-public/{CFT_VERSION}/win64/chromedriver-win64.zip"
         
         # Download chromedriver zip
         zip_path = os.path.join(chromedriver_dir, "chromedriver.zip")
@@ -627,42 +785,75 @@ def main():
             os.remove(zip_path)
             
         print("ChromeDriver downloaded and extracted successfully")
+        return True
         
     except Exception as e:
         print(f"Failed to download ChromeDriver: {e}")
-        return
-    
+        return False
+
+def launch_browser(driver_path):
+    """Start Chrome with the downloaded ChromeDriver, returning None on failure"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
+    # Set up Chrome options
+    chrome_options = Options()
+    # chrome_options.add_argument("--headless")  # Uncomment to run in headless mode
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")  # Helps avoid detection
+    chrome_options.add_argument("--start-maximized")  # Start with maximized window
+    # Set a realistic user agent at launch instead of a CDP round trip afterwards
+    chrome_options.add_argument(f"--user-agent={USER_AGENT}")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option("useAutomationExtension", False)
+
     # Initialize WebDriver
     if not os.path.exists(driver_path):
         print(f"Error: ChromeDriver not found at {driver_path}")
-        return
+        return None
         
     print(f"Using ChromeDriver at: {driver_path}")
     service = Service(driver_path)
     
     try:
         driver = webdriver.Chrome(service=service, options=chrome_options)
-        print("WebDriver initialized successfully")
+        print(f"WebDriver initialized successfully ({time.perf_counter() - START_TIME:.2f}s after start)")
+        return driver
     except Exception as e:
         print(f"Failed to initialize WebDriver: {e}")
         print("Please make sure Chrome and ChromeDriver versions match")
-        return
-    
-    # Set a realistic user agent
-    driver.execute_cdp_cmd('Network.setUserAgentOverride', {
-        "userAgent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36"
-    })
+        return None
+
+def prepare_browser(chromedriver_dir, driver_path):
+    """Download the driver and launch Chrome - the slow, network-bound part of startup"""
+    if not download_chromedriver(chromedriver_dir, driver_path):
+        return None
+    return launch_browser(driver_path)
+
+def run_account(driver, email, password, budget, report_first_navigation=False):
+    """Run the login and collection flow for one account within its budget.
+
+    Returns a result dict whose ``status`` is ``"collected"``, ``"failed"`` or
+    ``"timed_out"``; timed out runs also name the ``step`` that ran out of time.
+    The dict also carries ``login_ok`` (None if login was never reached),
+    ``fallback_depth`` and ``site_latencies``.
+    """
+    result = {"status": "failed", "step": None, "attempts": 0, "login_ok": None}
     
     try:
         # Navigate to the website
-        driver.get("https://s.click.aliexpress.com/e/_DB2kEjh")
+        budget.enter("coin page")
+        navigate(driver, COIN_PAGE_URL, budget)
         print("Website loaded")
+        if report_first_navigation:
+            print(f"Time to first navigation: {time.perf_counter() - START_TIME:.2f}s")
         
         # Add random delay to simulate page load analysis by human
-        random_sleep(2, 4)
+        random_sleep(2, 4, budget)
         
         # Check if we need to login and proceed with login if necessary
-        login_successful = login(driver)
+        login_successful = login(driver, email, password, budget)
+        result["login_ok"] = login_successful
         if not login_successful:
             print("Login process failed, attempting to continue anyway...")
         else:
@@ -674,23 +865,27 @@ def main():
         
         while total_attempts < max_total_attempts:
             total_attempts += 1
+            result["attempts"] = total_attempts
+            budget.start_attempt(total_attempts)
             print(f"Starting collection attempt {total_attempts}/{max_total_attempts}")
             
             # STEP 1-5: Change country to Korea (Step 6 is inside the function)
             print("RESTARTING FROM STEP 1: Changing country to Korea")
-            if change_country_to_korea(driver):
+            if change_country_to_korea(driver, budget):
                 # After saving country, the page should reload with Korean interface
                 # Wait a bit for the page to reload/update
-                random_sleep(5, 7)
+                random_sleep(5, 7, budget)
                 
                 # Navigate to the coin page
                 print("Going to coin page after country change.")
-                driver.get("https://s.click.aliexpress.com/e/_DB2kEjh")
-                random_sleep(5, 7)
+                budget.enter("coin page")
+                navigate(driver, COIN_PAGE_URL, budget)
+                random_sleep(5, 7, budget)
                 
                 # STEP 7: Look for the collect button
-                if find_and_click_collect_button(driver):
+                if find_and_click_collect_button(driver, budget):
                     print("Successfully collected coins!")
+                    result["status"] = "collected"
                     break  # Exit the loop if successful
                 else:
                     print(f"Failed to find collect button on attempt {total_attempts}, restarting from Step 1")
@@ -701,17 +896,298 @@ def main():
                 # If we're on the last attempt and country change failed, try the coin page anyway
                 if total_attempts >= max_total_attempts:
                     print("Maximum attempts reached. Trying coin page directly as last resort...")
-                    driver.get("https://s.click.aliexpress.com/e/_DB2kEjh")
-                    random_sleep(5, 7)
-                    find_and_click_collect_button(driver)
+                    budget.enter("coin page")
+                    navigate(driver, COIN_PAGE_URL, budget)
+                    random_sleep(5, 7, budget)
+                    if find_and_click_collect_button(driver, budget):
+                        result["status"] = "collected"
                 
-        if total_attempts >= max_total_attempts:
+        if result["status"] != "collected":
             print("Maximum attempts reached without successful coin collection.")
             
         print("Coin collection process completed.")
         
+    except RunTimeout as e:
+        print(f"Run budget of {budget.seconds:g}s used up, aborting: {e}")
+        result["status"] = "timed_out"
+        result["step"] = e.step
+    
     except Exception as e:
         print(f"An error occurred: {e}")
+        result["step"] = budget.step
+    
+    result["elapsed"] = round(budget.elapsed(), 1)
+    result["fallback_depth"] = budget.fallback_depth()
+    result["site_latencies"] = {step: round(seconds, 2) for step, seconds in budget.site_latencies.items()}
+    return result
+
+class ConcurrencyController:
+    """AIMD controller for how many accounts run at once and how far apart they start.
+
+    Every finished run is checked for signs that the site is pushing back: a
+    failed login, a timeout, deep selector fallbacks or site waits that are
+    much slower than usual. Clean runs raise the worker limit by one per
+    window of results and shorten the gap between account starts; a run
+    showing pushback halves the limit and doubles the gap. Runs that were
+    started before the last cut only ever hold the limit, so one slow wave of
+    accounts is not punished twice. Runs that ended with status ``"error"``
+    failed on our side (browser launch, crashed thread) and also just hold.
+    """
+
+    def __init__(self, max_workers=3, min_pacing=10.0, max_pacing=300.0,
+                 fallback_limit=2, latency_tolerance=1.5, latency_smoothing=0.2):
+        self.max_workers = max_workers
+        self.min_pacing = min_pacing
+        self.max_pacing = max_pacing
+        # Each step has at most two fallbacks, so the default flags a step
+        # that had to use its last-resort selector
+        self.fallback_limit = fallback_limit
+        self.latency_tolerance = latency_tolerance
+        self.latency_smoothing = latency_smoothing
+        self.limit = 1.0
+        self.pacing = min_pacing
+        self.baseline_latency = None
+        self.last_decrease = None
+        self.completed = 0
+        self.history = []
+        self.started = time.monotonic()
+        self.lock = threading.Lock()
+
+    @property
+    def workers(self):
+        """Number of accounts allowed to run at the same time"""
+        return max(1, int(self.limit))
+
+    def rate(self, count):
+        """Convert a count since the controller started into a per-hour rate"""
+        # monotonic() ticks only every ~16 ms on Windows, so guard against zero
+        return count / max(time.monotonic() - self.started, 1e-6) * 3600
+
+    def pushback(self, result):
+        """Return the reasons, other than slow site waits, a run suggests the site is overloaded"""
+        reasons = []
+        if result["status"] == "timed_out":
+            reasons.append(f"timed out at step {result['step']}")
+        if result.get("login_ok") is False:
+            reasons.append("login failed")
+        if result.get("fallback_depth", 0) >= self.fallback_limit:
+            reasons.append(f"fallback depth {result['fallback_depth']}")
+        return reasons
+
+    def record(self, result, started):
+        """Update the worker limit and pacing from a run that began at ``started``"""
+        with self.lock:
+            if result["status"] == "collected":
+                self.completed += 1
+
+            if result["status"] == "error":
+                decision = "hold"
+                reasons = [f"local error at step {result['step']}"]
+            else:
+                reasons = self.pushback(result)
+                other_pushback = bool(reasons)
+
+                latencies = result.get("site_latencies") or {}
+                if latencies:
+                    mean_latency = sum(latencies.values()) / len(latencies)
+                    baseline = self.baseline_latency
+                    if baseline is not None and mean_latency > baseline * self.latency_tolerance:
+                        reasons.append(f"mean site wait {mean_latency:.2f}s vs baseline {baseline:.2f}s")
+                    # The baseline is an exponentially weighted average of runs
+                    # without login, timeout or fallback trouble. Runs flagged
+                    # only for latency still feed it, so a lasting change in the
+                    # site's speed is absorbed instead of cutting concurrency forever.
+                    if not other_pushback:
+                        if baseline is None:
+                            self.baseline_latency = mean_latency
+                        else:
+                            self.baseline_latency += self.latency_smoothing * (mean_latency - baseline)
+
+                if not reasons:
+                    decision = "increase"
+                    self.limit = min(self.max_workers, self.limit + 1 / self.limit)
+                    self.pacing = max(self.min_pacing, self.pacing - self.min_pacing)
+                elif self.last_decrease is not None and started < self.last_decrease:
+                    decision = "hold"
+                else:
+                    decision = "decrease"
+                    self.limit = max(1.0, self.limit / 2)
+                    self.pacing = min(self.max_pacing, self.pacing * 2)
+                    self.last_decrease = time.monotonic()
+
+            self.history.append((decision, self.workers, reasons))
+            print(f"[controller] {decision}: workers={self.workers} (limit {self.limit:.2f}), "
+                  f"pacing={self.pacing:g}s, {self.rate(self.completed):.1f} accounts/hour"
+                  + (f" - {'; '.join(reasons)}" if reasons else ""))
+
+class AccountOutput:
+    """Stand-in for stdout that prefixes each line a worker prints with its account.
+
+    Lines are buffered per thread and written whole, so concurrent accounts
+    do not interleave inside a line.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def set_account(self, account):
+        self.local.account = account
+
+    def write(self, text):
+        *lines, self.local.buffer = (getattr(self.local, "buffer", "") + text).split("\n")
+        account = getattr(self.local, "account", None)
+        with self.lock:
+            for line in lines:
+                self.stream.write(f"[{account}] {line}\n" if account else f"{line}\n")
+        return len(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+def run_accounts(accounts, run_one, controller):
+    """Run every account through ``run_one``, letting the controller set concurrency and pacing"""
+    pending = list(accounts)
+    active = {}
+    results = []
+    last_start = None
+    
+    output = AccountOutput(sys.stdout)
+    
+    def run_labelled(account):
+        output.set_account(account["email"])
+        try:
+            return run_one(account)
+        finally:
+            output.set_account(None)
+    
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=controller.max_workers) as executor:
+            while pending or active:
+                # Measured from the last start with the current pacing, so a
+                # cut also pushes back a start that was already due soon
+                now = time.monotonic()
+                next_start = now if last_start is None else last_start + controller.pacing
+                if pending and len(active) < controller.workers and now >= next_start:
+                    account = pending.pop(0)
+                    print(f"Starting account {account['email']} ({len(active) + 1}/{controller.workers} running)")
+                    active[executor.submit(run_labelled, account)] = (account, now)
+                    last_start = now
+                    continue
+                
+                if not active:
+                    # Nothing to wait on, so wait() would return at once
+                    time.sleep(max(0.0, next_start - now))
+                    continue
+                
+                # Sleep until a run finishes or the next start is due
+                timeout = None
+                if pending and len(active) < controller.workers:
+                    timeout = max(0.0, next_start - now)
+                done, _ = wait(active, timeout=timeout, return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    account, started = active.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"Run for {account['email']} crashed: {e}")
+                        result = {"status": "error", "step": None, "attempts": 0, "login_ok": None}
+                    result["account"] = account["email"]
+                    print(f"Run result: {result}")
+                    controller.record(result, started)
+                    results.append(result)
+    finally:
+        sys.stdout = output.stream
+    
+    collected = sum(1 for result in results if result["status"] == "collected")
+    elapsed = time.monotonic() - controller.started
+    print(f"Collected coins for {collected}/{len(results)} accounts in {elapsed:.1f}s "
+          f"({controller.rate(collected):.1f} accounts/hour)")
+    return results
+
+def load_accounts(path):
+    """Read accounts from a CSV file with email, password and optional account_class columns"""
+    import csv
+
+    with open(path, newline="", encoding="utf-8") as f:
+        accounts = [row for row in csv.DictReader(f) if row.get("email") and row.get("password")]
+    for account in accounts:
+        account["account_class"] = account.get("account_class") or DEFAULT_ACCOUNT_CLASS
+    return accounts
+
+def run_accounts_file(path, max_workers, chromedriver_dir, driver_path):
+    """Collect coins for every account listed in the CSV file"""
+    try:
+        accounts = load_accounts(path)
+    except Exception as e:
+        print(f"Error: Could not read accounts from {path}: {e}")
+        sys.exit(1)
+    
+    if not accounts:
+        print(f"Error: No accounts with an email and password found in {path}")
+        sys.exit(1)
+    
+    print(f"Loaded {len(accounts)} accounts from {path}")
+    
+    # Fetch the driver once for all accounts while selenium loads in the background
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        version_future = executor.submit(detect_chrome_version)
+        executor.submit(importlib.import_module, "selenium.webdriver")
+        
+        downloaded = download_chromedriver(chromedriver_dir, driver_path)
+        
+        chrome_version = version_future.result()
+        print(f"Using Chrome for Testing driver {CFT_VERSION} for Chrome {chrome_version}")
+    
+    if not downloaded:
+        return
+    
+    def run_one(account):
+        driver = launch_browser(driver_path)
+        if not driver:
+            return {"status": "error", "step": "browser launch", "attempts": 0, "login_ok": None}
+        try:
+            budget = RunBudget(account_class_budget(account["account_class"]))
+            return run_account(driver, account["email"], account["password"], budget)
+        finally:
+            driver.quit()
+    
+    run_accounts(accounts, run_one, ConcurrencyController(max_workers=max_workers))
+
+def run_single_account(chromedriver_dir, driver_path):
+    """Collect coins for the account configured in the .env file"""
+    # Reading the .env file takes milliseconds, so check the credentials first
+    # and exit before anything is downloaded or launched if they are missing
+    credentials = load_credentials()
+    if not credentials:
+        sys.exit(1)
+    
+    # Run the independent startup pieces concurrently: the registry lookup and
+    # the selenium import proceed in the background while the driver is
+    # downloaded and the browser launched
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        version_future = executor.submit(detect_chrome_version)
+        executor.submit(importlib.import_module, "selenium.webdriver")
+        browser_future = executor.submit(prepare_browser, chromedriver_dir, driver_path)
+        
+        chrome_version = version_future.result()
+        print(f"Using Chrome for Testing driver {CFT_VERSION} for Chrome {chrome_version}")
+        driver = browser_future.result()
+    
+    if not driver:
+        return
+    
+    email, password = credentials
+    
+    try:
+        result = run_account(driver, email, password, load_run_budget(), report_first_navigation=True)
+        print(f"Run result: {result}")
     
     finally:
         # Don't close the browser immediately
@@ -719,5 +1195,28 @@ def main():
         random_sleep(3, 5)
         driver.quit()
 
+def main():
+    """Main function to run the coin collection process"""
+    parser = argparse.ArgumentParser(description="Collect the daily AliExpress coins")
+    parser.add_argument("--accounts", metavar="CSV",
+                        help="run every account in a CSV file with email, password and account_class columns")
+    parser.add_argument("--max-workers", type=int, default=3,
+                        help="most accounts to run at the same time with --accounts (default: 3)")
+    args = parser.parse_args()
+    if args.max_workers < 1:
+        parser.error("--max-workers must be at least 1")
+    
+    # Define path to chromedriver
+    chromedriver_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "drivers")
+    os.makedirs(chromedriver_dir, exist_ok=True)
+    
+    # Use direct path to the chromedriver in the drivers folder
+    driver_path = os.path.join(chromedriver_dir, "chromedriver.exe")
+    
+    if args.accounts:
+        run_accounts_file(args.accounts, args.max_workers, chromedriver_dir, driver_path)
+    else:
+        run_single_account(chromedriver_dir, driver_path)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import collect_coins
+
+
+@pytest.fixture(autouse=True)
+def fast_flow(monkeypatch):
+    """Skip the human-like pauses and keep element waits short"""
+    monkeypatch.setattr(collect_coins, "random_sleep", lambda *args, **kwargs: None)
+    monkeypatch.setattr(collect_coins, "ELEMENT_WAIT_TIMEOUT", 0.01)
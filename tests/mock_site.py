@@ -0,0 +1,94 @@
+"""Local stand-in for AliExpress that drives the real step functions.
+
+Once more than ``capacity`` sessions are open, each extra session makes every
+element lookup ``slowdown`` times slower and adds ``challenge_rate`` to the
+chance that an element is replaced by a challenge page for the rest of that
+page load. A challenged login selector fails the sign-in; anywhere else the
+step functions fall back to their next selector.
+"""
+
+import random
+import threading
+import time
+
+from selenium.common.exceptions import NoSuchElementException
+
+
+class MockSite:
+    def __init__(self, capacity=2, latency=0.005, slowdown=2.0, challenge_rate=0.0, missing=()):
+        self.capacity = capacity
+        self.latency = latency
+        self.slowdown = slowdown
+        self.challenge_rate = challenge_rate
+        self.missing = set(missing)
+        self.sessions = 0
+        self.lock = threading.Lock()
+
+    def open(self):
+        with self.lock:
+            self.sessions += 1
+        return MockDriver(self)
+
+    def close(self):
+        with self.lock:
+            self.sessions -= 1
+
+    def overload(self):
+        with self.lock:
+            return max(0, self.sessions - self.capacity)
+
+    def serve(self):
+        time.sleep(self.latency * (1 + self.slowdown * self.overload()))
+
+
+class MockElement:
+    text = "KO/ 대한민국"
+
+    def __init__(self, driver):
+        self.parent = driver
+
+    def click(self):
+        pass
+
+    def clear(self):
+        pass
+
+    def send_keys(self, *keys):
+        pass
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+
+class MockDriver:
+    def __init__(self, site):
+        self.site = site
+        self.challenged = {}
+
+    def get(self, url):
+        self.site.serve()
+        self.challenged = {}
+
+    def set_page_load_timeout(self, seconds):
+        pass
+
+    def find_element(self, by, value):
+        self.site.serve()
+        if value not in self.challenged:
+            self.challenged[value] = random.random() < self.site.challenge_rate * self.site.overload()
+        if value in self.site.missing or self.challenged[value]:
+            raise NoSuchElementException(value)
+        return MockElement(self)
+
+    def execute_script(self, script, *args):
+        # The JavaScript element searches find nothing on the mock
+        return [] if "return" in script else None
+
+    def execute(self, command, params=None):
+        return {"value": None}
+
+    def quit(self):
+        self.site.close()
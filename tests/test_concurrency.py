@@ -0,0 +1,179 @@
+import time
+
+import collect_coins
+from collect_coins import ConcurrencyController, RunBudget, run_account, run_accounts
+from mock_site import MockSite
+
+
+def make_accounts(count):
+    return [{"email": f"mock{i}@example.com", "password": "secret", "account_class": "standard"}
+            for i in range(count)]
+
+
+def site_runner(site, budget=2.0):
+    def run_one(account):
+        driver = site.open()
+        try:
+            return run_account(driver, account["email"], account["password"], RunBudget(budget))
+        finally:
+            driver.quit()
+    return run_one
+
+
+def decisions(controller):
+    return [decision for decision, _, _ in controller.history]
+
+
+def test_run_account_collects_on_idle_site():
+    site = MockSite()
+    driver = site.open()
+    result = run_account(driver, "mock@example.com", "secret", RunBudget(5))
+    assert result["status"] == "collected"
+    assert result["login_ok"] is True
+    assert result["fallback_depth"] == 0
+    assert "login (attempt 1)" in result["site_latencies"]
+
+
+def test_missing_selectors_take_the_real_fallback_paths():
+    site = MockSite(missing={
+        "//div[contains(@class, 'ship-to--menuItem--')]",
+        "//div[contains(@class, 'checkin-button')]",
+    })
+    driver = site.open()
+    result = run_account(driver, "mock@example.com", "secret", RunBudget(5))
+    assert result["status"] == "collected"
+    # The ship-to step fell back once; the ordered collect selectors do not count
+    assert result["fallback_depth"] == 1
+
+
+def test_later_collect_selector_on_a_healthy_site_still_increases():
+    site = MockSite(missing={
+        "//div[contains(@class, 'checkin-button')]",
+        "//div[contains(text(), 'Collect') and contains(@class, 'button')]",
+        "//div[contains(text(), '출석체크') and contains(@class, 'button')]",
+    })
+    controller = ConcurrencyController(max_workers=2, min_pacing=0.0)
+    results = run_accounts(make_accounts(1), site_runner(site), controller)
+
+    assert results[0]["status"] == "collected"
+    assert results[0]["fallback_depth"] == 0
+    assert decisions(controller) == ["increase"]
+
+
+def test_limit_drops_under_overload():
+    site = MockSite(capacity=1, challenge_rate=1.0)
+    controller = ConcurrencyController(max_workers=4, min_pacing=0.0, max_pacing=0.0)
+    run_accounts(make_accounts(6), site_runner(site, budget=1.0), controller)
+
+    assert "decrease" in decisions(controller)
+    # Both runs of the overloaded pair started before the first cut, so the second only holds
+    assert "hold" in decisions(controller)
+    assert max(workers for _, workers, _ in controller.history) <= 2
+
+
+def test_limit_recovers_after_clean_runs():
+    site = MockSite(capacity=10)
+    # Millisecond site waits are noisy; this test is about recovery, not latency
+    controller = ConcurrencyController(max_workers=3, min_pacing=0.01, max_pacing=0.04,
+                                       latency_tolerance=10.0)
+    controller.limit = 3.0
+    controller.record({"status": "timed_out", "step": "login"}, time.monotonic())
+    assert controller.workers == 1
+    assert controller.pacing == 0.02
+
+    run_accounts(make_accounts(6), site_runner(site), controller)
+
+    assert decisions(controller)[1:] == ["increase"] * 6
+    assert controller.workers == 3
+    assert controller.pacing == 0.01
+
+
+def test_runs_started_before_a_cut_hold():
+    controller = ConcurrencyController(max_workers=4)
+    controller.limit = 4.0
+    failed = {"status": "failed", "step": None, "login_ok": False}
+
+    started = time.monotonic() - 1
+    controller.record(failed, started)
+    controller.record(failed, started)
+    assert decisions(controller) == ["decrease", "hold"]
+    assert controller.workers == 2
+
+    controller.record(failed, time.monotonic() + 1)
+    assert decisions(controller)[-1] == "decrease"
+    assert controller.workers == 1
+
+
+def test_local_errors_do_not_cut_concurrency():
+    controller = ConcurrencyController(max_workers=4, min_pacing=0.0)
+    controller.limit = 4.0
+
+    def run_one(account):
+        if account["email"] == "mock0@example.com":
+            raise RuntimeError("chrome crashed")
+        return {"status": "error", "step": "browser launch", "attempts": 0, "login_ok": None}
+
+    results = run_accounts(make_accounts(2), run_one, controller)
+
+    assert [result["status"] for result in results] == ["error", "error"]
+    assert decisions(controller) == ["hold", "hold"]
+    assert controller.limit == 4.0
+    assert controller.pacing == controller.min_pacing
+
+
+def test_latency_baseline_ignores_noise_and_flags_slow_sites():
+    controller = ConcurrencyController(max_workers=4)
+    controller.limit = 4.0
+
+    for latency in [1.0, 1.2, 0.8, 1.1, 0.9, 1.3]:
+        controller.record({"status": "collected", "login_ok": True,
+                           "site_latencies": {"login (attempt 1)": latency}}, time.monotonic())
+    assert set(decisions(controller)) == {"increase"}
+    assert 0.9 < controller.baseline_latency < 1.2
+
+    controller.record({"status": "collected", "login_ok": True,
+                       "site_latencies": {"login (attempt 1)": 2.5}}, time.monotonic())
+    decision, _, reasons = controller.history[-1]
+    assert decision == "decrease"
+    assert reasons[0].startswith("mean site wait 2.50s")
+
+
+def test_output_is_prefixed_with_the_account(capsys):
+    def run_one(account):
+        print("Login failed: no password field")
+        return {"status": "collected", "step": None, "attempts": 1, "login_ok": True}
+
+    run_accounts(make_accounts(2), run_one, ConcurrencyController(max_workers=2, min_pacing=0.0))
+
+    out = capsys.readouterr().out
+    assert "[mock0@example.com] Login failed: no password field" in out
+    assert "[mock1@example.com] Login failed: no password field" in out
+
+
+def test_scheduler_idles_while_waiting_to_start_the_next_account():
+    controller = ConcurrencyController(max_workers=1, min_pacing=0.5)
+
+    def run_one(account):
+        return {"status": "collected", "step": None, "attempts": 1, "login_ok": True}
+
+    wall, cpu = time.monotonic(), time.process_time()
+    run_accounts(make_accounts(3), run_one, controller)
+    wall, cpu = time.monotonic() - wall, time.process_time() - cpu
+
+    assert wall >= 1.0
+    assert cpu < wall / 4
+
+
+def test_cut_pushes_back_an_already_scheduled_start():
+    controller = ConcurrencyController(max_workers=1, min_pacing=0.2, max_pacing=1.0)
+    starts = []
+
+    def run_one(account):
+        starts.append(time.monotonic())
+        return {"status": "failed", "step": None, "attempts": 1, "login_ok": False}
+
+    run_accounts(make_accounts(2), run_one, controller)
+
+    assert decisions(controller) == ["decrease", "decrease"]
+    # The first failure doubled the pacing before the second account was due
+    assert starts[1] - starts[0] >= 0.4